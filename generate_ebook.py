@@ -13,16 +13,67 @@ Usage:
 """
 
 import os
+import re
 import sys
-import json
-import yaml
+import shutil
+import itertools
+import functools
+import hashlib
+import inspect
+import tempfile
+import threading
 import argparse
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, Optional
 
-# Import LLM client
-from llm_client import create_llm_client, create_image_client
+# yaml, json, asyncio, concurrent.futures and llm_client are imported inside
+# the functions that use them, so `--help` and argument errors return quickly.
+
+
+def _yaml_load(stream) -> Any:
+    """Parse YAML, preferring the libyaml C loader over the pure-Python one"""
+    import yaml
+    return yaml.load(stream, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+
+
+def _yaml_dump(data: Any, stream):
+    """Write YAML, preferring the libyaml C dumper over the pure-Python one"""
+    import yaml
+    yaml.dump(data, stream, Dumper=getattr(yaml, 'CSafeDumper', yaml.SafeDumper),
+              default_flow_style=False, sort_keys=False)
+
+
+@functools.lru_cache(maxsize=None)
+def _orjson():
+    """The orjson module if it is installed, else None (looked up once)"""
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize obj as indented JSON bytes, using orjson when it is installed
+
+    Non-string dict keys are written as strings, as json.dumps does.
+    """
+    orjson = _orjson()
+    if orjson is None:
+        import json
+        return json.dumps(obj, indent=2).encode('utf-8')
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+
+def _loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it is installed"""
+    orjson = _orjson()
+    if orjson is None:
+        import json
+        return json.loads(data)
+    return orjson.loads(data)
+
 
 # Color codes for terminal output
 class Colors:
@@ -37,17 +88,33 @@ class Colors:
     UNDERLINE = '\033[4m'
 
 
+# When output is piped or captured (e.g. CI logs), drop ANSI codes and banners
+_TTY = sys.stdout.isatty()
+if not _TTY:
+    for _name in [name for name in vars(Colors) if name.isupper()]:
+        setattr(Colors, _name, '')
+
+_EQ80 = '=' * 80
+_DASH80 = '─' * 80
+
+
 def print_header(text: str):
     """Print formatted header"""
-    print(f"\n{Colors.HEADER}{Colors.BOLD}{'='*80}{Colors.ENDC}")
+    if not _TTY:
+        print(f"\n== {text} ==\n", flush=True)
+        return
+    print(f"\n{Colors.HEADER}{Colors.BOLD}{_EQ80}{Colors.ENDC}")
     print(f"{Colors.HEADER}{Colors.BOLD}{text.center(80)}{Colors.ENDC}")
-    print(f"{Colors.HEADER}{Colors.BOLD}{'='*80}{Colors.ENDC}\n")
+    print(f"{Colors.HEADER}{Colors.BOLD}{_EQ80}{Colors.ENDC}\n")
 
 
 def print_stage(stage_num: int, stage_name: str):
     """Print stage header"""
+    if not _TTY:
+        print(f"\n[Stage {stage_num}] {stage_name}", flush=True)
+        return
     print(f"\n{Colors.OKCYAN}{Colors.BOLD}[Stage {stage_num}] {stage_name}{Colors.ENDC}")
-    print(f"{Colors.OKCYAN}{'─'*80}{Colors.ENDC}\n")
+    print(f"{Colors.OKCYAN}{_DASH80}{Colors.ENDC}\n")
 
 
 def print_success(text: str):
@@ -70,6 +137,248 @@ def print_info(text: str):
     print(f"{Colors.OKBLUE}ℹ {text}{Colors.ENDC}")
 
 
+# On-disk LLM response cache, shared across runs (disable with --no-cache).
+# EBOOKGEN_CACHE_DIR overrides the location. Only temperature-0 calls (the Stage 0
+# config and Stage 1 queries) are cached by default; sampled responses are cached
+# too with --deterministic-cache, in which case reruns replay them.
+CACHE_DIR = Path(os.environ.get('EBOOKGEN_CACHE_DIR') or Path.home() / '.ebookgen' / 'cache')
+_cache_enabled = True
+_cache_sampled = False
+
+# Generation settings that change a response and so belong in the cache key
+_KEY_PARAMS = ('max_tokens', 'temperature')
+
+
+def _effective_params(llm_client, params: dict) -> dict:
+    """Generation settings the client will actually use: explicit params over generate()'s defaults"""
+    effective = {name: p.default for name, p in inspect.signature(llm_client.generate).parameters.items()
+                 if name in _KEY_PARAMS and p.default is not p.empty}
+    effective.update(params)
+    return effective
+
+
+def _cache_path(llm_client, prompt: str, cache_prefix: Optional[str] = None, **params) -> Path:
+    """Content-addressed cache location for a (provider, model, prompt, params) tuple
+
+    params are the effective generation settings (see _effective_params), so
+    the same prompt with different settings is a separate entry.
+    """
+    import json
+
+    key_fields = {
+        'provider': type(llm_client).__name__,
+        'model': getattr(llm_client, 'model', ''),
+        'prefix': cache_prefix or '',
+        'prompt': prompt,
+        'params': params,
+    }
+    key = hashlib.blake2b(json.dumps(key_fields, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+    return CACHE_DIR / f"{key}.json"
+
+
+def _read_cache(path: Path) -> Optional[str]:
+    """Return the cached response stored at path, or None on a miss"""
+    try:
+        text = _loads(path.read_bytes())['text']
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return text if isinstance(text, str) else None
+
+
+def _write_cache(path: Path, text: str):
+    """Store a response at path; written atomically so concurrent writers never leave a partial entry"""
+    tmp_name = None
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        entry = {'prompt_hash': path.stem, 'text': text, 'ts': datetime.now().isoformat()}
+        with tempfile.NamedTemporaryFile('wb', dir=CACHE_DIR, suffix='.tmp', delete=False) as tmp:
+            tmp_name = tmp.name
+            tmp.write(_dumps(entry))
+        os.replace(tmp_name, path)
+    except OSError as e:
+        if tmp_name:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+        print_warning(f"Could not write LLM cache entry: {e}")
+
+
+def _disk_cache_allowed(llm_client, params: dict) -> bool:
+    """Whether responses for llm_client with these effective params may use the disk cache
+
+    MockClient responses are instant and deterministic, so caching them would
+    only fill CACHE_DIR during test and CI runs. Sampled responses are only
+    cached when --deterministic-cache asks for it.
+    """
+    from llm_client import MockClient
+    if not _cache_enabled or isinstance(llm_client, MockClient):
+        return False
+    return _cache_sampled or params.get('temperature') == 0
+
+
+# Identical requests already in flight, keyed like the disk cache; a second
+# caller waits for the first caller's result instead of calling the API again
+_inflight: Dict[str, Any] = {}
+_inflight_lock = threading.Lock()
+_ainflight: Dict[str, Any] = {}
+
+
+def _coalesced(key: str, fetch):
+    """Run fetch() unless an identical call is already running, then share its result"""
+    from concurrent.futures import Future
+
+    with _inflight_lock:
+        future = _inflight.get(key)
+        owner = future is None
+        if owner:
+            future = _inflight[key] = Future()
+    if not owner:
+        return future.result()
+    try:
+        result = fetch()
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+async def _acoalesced(key: str, fetch):
+    """Async counterpart of _coalesced; fetch() returns an awaitable"""
+    import asyncio
+
+    future = _ainflight.get(key)
+    if future is not None:
+        return await asyncio.shield(future)
+    future = _ainflight[key] = asyncio.get_running_loop().create_future()
+    try:
+        result = await fetch()
+    except BaseException as e:
+        future.set_exception(e)
+        future.exception()  # mark retrieved when nobody else was waiting
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        _ainflight.pop(key, None)
+
+
+def _generate_and_cache(llm_client, prompt: str, cache_prefix: Optional[str], path: Optional[Path], params: dict) -> str:
+    """Call llm_client.generate() and store the response at path (None: don't cache)"""
+    text = llm_client.generate(prompt, cache_prefix=cache_prefix, **params)
+    if path is not None:
+        _write_cache(path, text)
+    return text
+
+
+async def _agenerate_and_cache(llm_client, prompt: str, cache_prefix: Optional[str], path: Optional[Path], params: dict) -> str:
+    """Await llm_client.agenerate() and store the response at path (None: don't cache)"""
+    text = await llm_client.agenerate(prompt, cache_prefix=cache_prefix, **params)
+    if path is not None:
+        _write_cache(path, text)
+    return text
+
+
+def _cached_generate(llm_client, prompt: str, *, stream: bool = False, on_delta=None,
+                     cache_prefix: Optional[str] = None, sink=None, accept=None, **params):
+    """Generate text for prompt, reusing a cached response when available.
+
+    cache_prefix carries static instructions shared across calls; clients
+    send it ahead of prompt so the provider can reuse its prompt cache.
+    Extra params (max_tokens, temperature, ...) go to the client; the settings
+    it will actually use are part of the cache key.
+    On a cache hit with streaming, on_delta receives the whole text at once.
+    Concurrent identical non-streaming calls share one API request.
+
+    With a sink (an open text file), the text is written there as it arrives
+    and the number of characters written is returned instead of the text.
+    If accept is given, only responses for which accept(text) is true are
+    cached or reused from the cache.
+    """
+    effective = _effective_params(llm_client, params)
+    use_cache = _disk_cache_allowed(llm_client, effective)
+    if stream and not use_cache:
+        return llm_client.stream_generate(prompt, on_delta=on_delta, cache_prefix=cache_prefix,
+                                          sink=sink, **params)
+
+    path = _cache_path(llm_client, prompt, cache_prefix, **effective)
+    text = _read_cache(path) if use_cache else None
+    if text is not None and accept is not None and not accept(text):
+        text = None
+    if text is not None:
+        if on_delta:
+            on_delta(text)
+    elif stream:
+        # The cache entry needs the whole text, so the client buffers it
+        # and deltas reach sink through on_delta
+        tee = on_delta
+        if sink is not None:
+            def tee(delta: str):
+                sink.write(delta)
+                if on_delta:
+                    on_delta(delta)
+        text = llm_client.stream_generate(prompt, on_delta=tee, cache_prefix=cache_prefix, **params)
+        if accept is None or accept(text):
+            _write_cache(path, text)
+        return len(text) if sink is not None else text
+    else:
+        store = path if use_cache and accept is None else None
+        text = _coalesced(path.stem, lambda: _generate_and_cache(llm_client, prompt, cache_prefix, store, params))
+        if use_cache and accept is not None and accept(text):
+            _write_cache(path, text)
+
+    if sink is not None:
+        sink.write(text)
+        return len(text)
+    return text
+
+
+async def _cached_agenerate(llm_client, prompt: str, *, cache_prefix: Optional[str] = None, **params) -> str:
+    """Async counterpart of _cached_generate, built on llm_client.agenerate()"""
+    effective = _effective_params(llm_client, params)
+    use_cache = _disk_cache_allowed(llm_client, effective)
+    path = _cache_path(llm_client, prompt, cache_prefix, **effective)
+    text = _read_cache(path) if use_cache else None
+    if text is None:
+        store = path if use_cache else None
+        text = await _acoalesced(path.stem, lambda: _agenerate_and_cache(llm_client, prompt, cache_prefix, store, params))
+    return text
+
+
+def _make_stream_printer(flush_size: int = 4096):
+    """Return (on_delta, flush) callbacks that echo streamed tokens to stdout.
+
+    Tokens are buffered and written out at newlines or once flush_size
+    characters have accumulated, instead of flushing stdout for every token.
+    Call flush() when the stream ends to print any remaining tail.
+    """
+    pending = []
+    size = 0
+
+    def flush():
+        nonlocal size
+        if pending:
+            sys.stdout.write(''.join(pending))
+            sys.stdout.flush()
+            pending.clear()
+            size = 0
+
+    def on_delta(delta: str):
+        nonlocal size
+        pending.append(delta)
+        size += len(delta)
+        if size >= flush_size or '\n' in delta:
+            flush()
+
+    return on_delta, flush
+
+
 def get_user_input(prompt: str, default: Optional[str] = None) -> str:
     """Get user input with optional default value"""
     if default:
@@ -89,22 +398,10 @@ def confirm_action(prompt: str) -> bool:
         print_warning("Please enter 'y' or 'n'")
 
 
-def generate_config_from_topic(topic: str, llm_client=None) -> Dict[str, Any]:
-    """
-    Stage 0: Auto-generate all configuration parameters from a single topic
-
-    This function uses an LLM to intelligently generate all required parameters
-    based on the user's topic input.
-    """
-    print_stage(0, "Auto-Generate Configuration Parameters")
-    print_info(f"Analyzing topic: '{topic}'")
-
-    # Prompt for LLM to generate configuration
-    prompt = f"""You are an expert eBook strategist and market analyst. Your task is to analyze a topic and generate optimal configuration parameters for an automated eBook generation system.
-
-Given Topic: {topic}
+# Static Stage 0 instructions, sent as a cacheable prefix ahead of the topic
+_CONFIG_PROMPT_PREFIX = """You are an expert eBook strategist and market analyst. Your task is to analyze a topic and generate optimal configuration parameters for an automated eBook generation system.
 
-Analyze this topic and generate the following parameters in valid YAML format. Be strategic, market-aware, and ensure all parameters work cohesively together.
+Analyze the given topic and generate the following parameters in valid YAML format. Be strategic, market-aware, and ensure all parameters work cohesively together.
 
 Required Output Format (YAML only, no explanations):
 
@@ -134,11 +431,25 @@ Instructions:
 
 Output only the YAML block. No additional commentary."""
 
+
+def generate_config_from_topic(topic: str, llm_client=None) -> Dict[str, Any]:
+    """
+    Stage 0: Auto-generate all configuration parameters from a single topic
+
+    This function uses an LLM to intelligently generate all required parameters
+    based on the user's topic input.
+    """
+    print_stage(0, "Auto-Generate Configuration Parameters")
+    print_info(f"Analyzing topic: '{topic}'")
+
+    prompt = f"Given Topic: {topic}\n"
+
     print_info("Generating optimized configuration parameters...")
 
     # If LLM client provided, use it; otherwise, generate defaults
     if llm_client:
-        config_yaml = llm_client.generate(prompt)
+        # Greedy decoding: the config is structured data, and temperature 0 makes it cacheable
+        config_yaml = _cached_generate(llm_client, prompt, cache_prefix=_CONFIG_PROMPT_PREFIX, temperature=0)
         # Parse YAML response
         try:
             # Extract YAML from markdown code block if present
@@ -147,7 +458,7 @@ Output only the YAML block. No additional commentary."""
             elif "```" in config_yaml:
                 config_yaml = config_yaml.split("```")[1].split("```")[0].strip()
 
-            config = yaml.safe_load(config_yaml)
+            config = _yaml_load(config_yaml)
             # Ensure config is a dictionary
             if not isinstance(config, dict):
                 raise ValueError("Config is not a dictionary")
@@ -172,47 +483,53 @@ Output only the YAML block. No additional commentary."""
     return config
 
 
+# Book templates: word counts and chapter layout applied on top of a config
+_TEMPLATES: Dict[str, Dict[str, int]] = {
+    # Standard (default) template: Intro 600-900, 5 chapters @ 1200, Final thoughts 600-900, Leave a review 300-500
+    'standard': {
+        'intro_min_words': 600, 'intro_max_words': 900,
+        'num_chapters': 5, 'chapter_length': 1200,
+        'final_min_words': 600, 'final_max_words': 900,
+        'review_min_words': 300, 'review_max_words': 500,
+    },
+    # Quickstart: shorter book for rapid consumption
+    'quickstart': {
+        'intro_min_words': 300, 'intro_max_words': 500,
+        'num_chapters': 3, 'chapter_length': 800,
+        'final_min_words': 300, 'final_max_words': 500,
+        'review_min_words': 150, 'review_max_words': 250,
+    },
+    # Deep Dive: longer, more comprehensive
+    'deepdive': {
+        'intro_min_words': 800, 'intro_max_words': 1200,
+        'num_chapters': 8, 'chapter_length': 2000,
+        'final_min_words': 800, 'final_max_words': 1200,
+        'review_min_words': 400, 'review_max_words': 700,
+    },
+}
+
+
 def apply_template_defaults(config: Dict[str, Any], template: str) -> Dict[str, Any]:
     """Apply template-specific defaults on top of existing config."""
-    # Standard (default) template: Intro 600-900, 5 chapters @ 1200, Final thoughts 600-900, Leave a review 300-500
-    if template == 'standard':
-        config['intro_min_words'] = 600
-        config['intro_max_words'] = 900
-        config['num_chapters'] = 5
-        config['chapter_length'] = 1200
-        config['final_min_words'] = 600
-        config['final_max_words'] = 900
-        config['review_min_words'] = 300
-        config['review_max_words'] = 500
-    elif template == 'quickstart':
-        # Quickstart: shorter book for rapid consumption
-        config['intro_min_words'] = 300
-        config['intro_max_words'] = 500
-        config['num_chapters'] = 3
-        config['chapter_length'] = 800
-        config['final_min_words'] = 300
-        config['final_max_words'] = 500
-        config['review_min_words'] = 150
-        config['review_max_words'] = 250
-    elif template == 'deepdive':
-        # Deep Dive: longer, more comprehensive
-        config['intro_min_words'] = 800
-        config['intro_max_words'] = 1200
-        config['num_chapters'] = 8
-        config['chapter_length'] = 2000
-        config['final_min_words'] = 800
-        config['final_max_words'] = 1200
-        config['review_min_words'] = 400
-        config['review_max_words'] = 700
+    config.update(_TEMPLATES.get(template, {}))
     return config
 
 
+# Topic keywords used by generate_default_config, matched as whole words
+_WORD_RE = re.compile(r"[a-z]+")
+_FITNESS_KW = frozenset({'fitness', 'weight', 'workout', 'workouts', 'exercise', 'exercises',
+                         'muscle', 'muscles', 'diet', 'diets', 'nutrition'})
+_WELLNESS_KW = frozenset({'wellness', 'health', 'mental', 'stress', 'sleep', 'mindfulness'})
+_BEGINNER_KW = frozenset({'beginner', 'beginners', 'start', 'started', 'starting', 'starter'})
+
+
 def generate_default_config(topic: str) -> Dict[str, Any]:
     """Generate default configuration when LLM is not available"""
     # Intelligent defaults based on common patterns
-    is_fitness = any(word in topic.lower() for word in ['fitness', 'weight', 'workout', 'exercise', 'muscle', 'diet', 'nutrition'])
-    is_wellness = any(word in topic.lower() for word in ['wellness', 'health', 'mental', 'stress', 'sleep', 'mindfulness'])
-    is_beginner = 'beginner' in topic.lower() or 'start' in topic.lower()
+    words = set(_WORD_RE.findall(topic.lower()))
+    is_fitness = not _FITNESS_KW.isdisjoint(words)
+    is_wellness = not _WELLNESS_KW.isdisjoint(words)
+    is_beginner = not _BEGINNER_KW.isdisjoint(words)
 
     return {
         'topic': topic,
@@ -290,17 +607,48 @@ def edit_config_interactive(config: Dict[str, Any]) -> Dict[str, Any]:
     return config
 
 
+def _config_hash(config: Dict[str, Any]) -> str:
+    """Fingerprint of a config's user-visible keys (private __keys__ excluded)"""
+    # Keyed on str(k): YAML allows keys of mixed types (e.g. 2025 next to topic)
+    items = sorted(((k, v) for k, v in config.items() if not str(k).startswith('__')),
+                   key=lambda kv: str(kv[0]))
+    return hashlib.blake2b(repr(items).encode('utf-8')).hexdigest()
+
+
+def load_config(config_path) -> Dict[str, Any]:
+    """Load configuration from a YAML file.
+
+    The source path and a hash of the loaded values are stashed on the config
+    so save_config can copy the original file if nothing was changed.
+    """
+    with open(config_path, 'r') as f:
+        config = _yaml_load(f)
+    if isinstance(config, dict):
+        config['__src_path__'] = str(config_path)
+        config['__src_hash__'] = _config_hash(config)
+    return config
+
+
 def save_config(config: Dict[str, Any], output_dir: Path):
     """Save configuration to file"""
     config_path = output_dir / "config.yaml"
-    with open(config_path, 'w') as f:
-        yaml.dump(config, f, default_flow_style=False, sort_keys=False)
+    src_path = config.pop('__src_path__', None)
+    src_hash = config.pop('__src_hash__', None)
+    if src_path and src_hash == _config_hash(config):
+        # Unchanged since loading: reuse the original file instead of re-dumping
+        if not (config_path.exists() and os.path.samefile(src_path, config_path)):
+            shutil.copyfile(src_path, config_path)
+    else:
+        with open(config_path, 'w') as f:
+            _yaml_dump(config, f)
     print_success(f"Configuration saved to: {config_path}")
     return config_path
 
 
-def execute_pipeline(config: Dict[str, Any], output_dir: Path, llm_client=None):
+def execute_pipeline(config: Dict[str, Any], output_dir: Path, llm_client=None, max_concurrent_requests: int = 1):
     """Execute all 9 stages of the eBook generation pipeline"""
+    from concurrent.futures import ThreadPoolExecutor
+
     print_header("Starting eBook Generation Pipeline")
 
     results = {
@@ -309,107 +657,146 @@ def execute_pipeline(config: Dict[str, Any], output_dir: Path, llm_client=None):
         'output_dir': str(output_dir)
     }
 
-    # Stage 1: SEO Query Generation
-    print_stage(1, "SEO Query Generation")
-    queries = stage_1_seo_queries(config, llm_client)
-    results['stages']['stage_1'] = {'queries': queries}
-    save_stage_output(output_dir, 'stage_1_queries.txt', '\n'.join(queries))
-    print_success(f"Generated {len(queries)} SEO queries")
-
-    # Stage 2: eBook Outline Generation
-    print_stage(2, "eBook Outline Generation")
-    outline = stage_2_outline(config, queries, llm_client)
-    results['stages']['stage_2'] = {'outline': outline}
-    save_stage_output(output_dir, 'stage_2_outline.md', outline)
-    print_success("eBook outline created")
-
-    # Attach output_dir to config so later stages can find the outline file
-    config['output_dir'] = str(output_dir)
-
-    # Stage 3: Table of Contents
-    print_stage(3, "Table of Contents Generation")
-    toc = stage_3_toc(outline, llm_client)
-    results['stages']['stage_3'] = {'toc': toc}
-    save_stage_output(output_dir, 'stage_3_toc.md', toc)
-    print_success("Table of Contents generated")
-
-    # Stage 4: Chapter Content Writing
-    print_stage(4, "Chapter Content Writing")
-    chapters = stage_4_chapters(config, queries, llm_client)
-    results['stages']['stage_4'] = {'chapters': chapters}
-    for i, chapter in enumerate(chapters, 1):
-        save_stage_output(output_dir, f'stage_4_chapter_{i}.md', chapter)
-    print_success(f"Generated {len(chapters)} chapters")
-
-    # Stage 5: Content Optimization
-    print_stage(5, "Content Optimization")
-    optimized_chapters = stage_5_optimize(chapters, llm_client)
-    results['stages']['stage_5'] = {'optimized_chapters': optimized_chapters}
-    for i, chapter in enumerate(optimized_chapters, 1):
-        save_stage_output(output_dir, f'stage_5_optimized_chapter_{i}.md', chapter)
-    print_success(f"Optimized {len(optimized_chapters)} chapters")
-
-    # Stage 6: Cover Design (parallel with 7-9)
-    print_stage(6, "eBook Cover Design Prompt Generation")
-    cover_prompt = stage_6_cover(config, optimized_chapters[0], llm_client)
-    results['stages']['stage_6'] = {'cover_prompt': cover_prompt}
-    save_stage_output(output_dir, 'stage_6_cover_prompt.txt', cover_prompt)
-    print_success("Cover design prompt generated")
-
-    # Stage 7: Interactive Elements
-    print_stage(7, "Interactive Element Creation")
-    interactive_elements = stage_7_interactive(optimized_chapters, llm_client)
-    results['stages']['stage_7'] = {'interactive_elements': interactive_elements}
-    save_stage_output(output_dir, 'stage_7_interactive_elements.json', json.dumps(interactive_elements, indent=2))
-    print_success(f"Created {len(interactive_elements)} interactive elements")
-
-    # Stage 8: Diagram Generation
-    print_stage(8, "Diagram Prompt Generation")
-    diagram_prompts = stage_8_diagrams(optimized_chapters, llm_client)
-    results['stages']['stage_8'] = {'diagram_prompts': diagram_prompts}
-    save_stage_output(output_dir, 'stage_8_diagram_prompts.json', json.dumps(diagram_prompts, indent=2))
-    print_success(f"Generated {len(diagram_prompts)} diagram prompts")
-
-    # Stage 9: Background Visuals
-    print_stage(9, "Background Visual Prompt Generation")
-    background_prompts = stage_9_backgrounds(optimized_chapters, llm_client)
-    results['stages']['stage_9'] = {'background_prompts': background_prompts}
-    save_stage_output(output_dir, 'stage_9_background_prompts.json', json.dumps(background_prompts, indent=2))
-    print_success(f"Generated {len(background_prompts)} background prompts")
-
-    # Compile final eBook
-    print_stage(10, "Final eBook Compilation")
-    ebook_path = compile_ebook(results, output_dir)
-    print_success(f"Production-ready eBook compiled: {ebook_path}")
-
-    # Save metadata
-    metadata_path = output_dir / 'generation_metadata.json'
-    with open(metadata_path, 'w') as f:
-        json.dump({
-            'timestamp': datetime.now().isoformat(),
-            'config': config,
-            'output_files': {
-                'ebook': str(ebook_path),
-                'cover_prompt': 'stage_6_cover_prompt.txt',
-                'diagram_prompts': 'stage_8_diagram_prompts.json',
-                'background_prompts': 'stage_9_background_prompts.json',
-                'interactive_elements': 'stage_7_interactive_elements.json'
-            }
-        }, f, indent=2)
+    # Stage outputs are queued here and written in one batch at the end (or
+    # when a stage fails), instead of one open/write/close per stage.
+    pending_outputs = []
+    try:
+        # Stage 1: SEO Query Generation
+        print_stage(1, "SEO Query Generation")
+        queries = stage_1_seo_queries(config, llm_client)
+        results['stages']['stage_1'] = {'queries': queries}
+        pending_outputs.append(('stage_1_queries.txt', '\n'.join(queries)))
+        print_success(f"Generated {len(queries)} SEO queries")
+
+        # Stage 2: eBook Outline Generation
+        print_stage(2, "eBook Outline Generation")
+        outline = stage_2_outline(config, queries, llm_client)
+        results['stages']['stage_2'] = {'outline': outline}
+        pending_outputs.append(('stage_2_outline.md', outline))
+        print_success("eBook outline created")
+
+        # Attach output_dir to config so later stages know where to write
+        config['output_dir'] = str(output_dir)
+
+        # Stage 3: Table of Contents
+        print_stage(3, "Table of Contents Generation")
+        toc = stage_3_toc(outline, llm_client)
+        results['stages']['stage_3'] = {'toc': toc}
+        pending_outputs.append(('stage_3_toc.md', toc))
+        print_success("Table of Contents generated")
+
+        # Stage 4: Chapter Content Writing
+        print_stage(4, "Chapter Content Writing")
+        chapters = stage_4_chapters(config, queries, llm_client, max_concurrent_requests, outline=outline)
+        results['stages']['stage_4'] = {'chapters': chapters}
+        print_success(f"Generated {len(chapters)} chapters")
+
+        # Stage 5: Content Optimization
+        print_stage(5, "Content Optimization")
+        optimized_chapters = stage_5_optimize(chapters, llm_client)
+        results['stages']['stage_5'] = {'optimized_chapters': optimized_chapters}
+        print_success(f"Optimized {len(optimized_chapters)} chapters")
+
+        # Stages 6-9 only read the optimized chapters, so run them concurrently.
+        # Submit everything first, then collect, so no stage waits on another.
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            cover_future = executor.submit(stage_6_cover, config, optimized_chapters[0], llm_client)
+            interactive_future = executor.submit(stage_7_interactive, optimized_chapters, llm_client)
+            diagram_future = executor.submit(stage_8_diagrams, optimized_chapters, llm_client)
+            background_future = executor.submit(stage_9_backgrounds, optimized_chapters, llm_client)
+
+            # Stage 6: Cover Design
+            print_stage(6, "eBook Cover Design Prompt Generation")
+            cover_prompt = cover_future.result()
+            results['stages']['stage_6'] = {'cover_prompt': cover_prompt}
+            pending_outputs.append(('stage_6_cover_prompt.txt', cover_prompt))
+            print_success("Cover design prompt generated")
+
+            # Stage 7: Interactive Elements
+            print_stage(7, "Interactive Element Creation")
+            interactive_elements = interactive_future.result()
+            results['stages']['stage_7'] = {'interactive_elements': interactive_elements}
+            pending_outputs.append(('stage_7_interactive_elements.json', _dumps(interactive_elements)))
+            print_success(f"Created {len(interactive_elements)} interactive elements")
+
+            # Stage 8: Diagram Generation
+            print_stage(8, "Diagram Prompt Generation")
+            diagram_prompts = diagram_future.result()
+            results['stages']['stage_8'] = {'diagram_prompts': diagram_prompts}
+            pending_outputs.append(('stage_8_diagram_prompts.json', _dumps(diagram_prompts)))
+            print_success(f"Generated {len(diagram_prompts)} diagram prompts")
+
+            # Stage 9: Background Visuals
+            print_stage(9, "Background Visual Prompt Generation")
+            background_prompts = background_future.result()
+            results['stages']['stage_9'] = {'background_prompts': background_prompts}
+            pending_outputs.append(('stage_9_background_prompts.json', _dumps(background_prompts)))
+            print_success(f"Generated {len(background_prompts)} background prompts")
+
+        # Compile final eBook
+        print_stage(10, "Final eBook Compilation")
+        ebook_path = compile_ebook(results, output_dir, llm_client)
+        print_success(f"Production-ready eBook compiled: {ebook_path}")
+
+        # Save metadata
+        pending_outputs.append(('generation_metadata.json', _dumps({
+                'timestamp': datetime.now().isoformat(),
+                'config': config,
+                'output_files': {
+                    'ebook': str(ebook_path),
+                    'cover_prompt': 'stage_6_cover_prompt.txt',
+                    'diagram_prompts': 'stage_8_diagram_prompts.json',
+                    'background_prompts': 'stage_9_background_prompts.json',
+                    'interactive_elements': 'stage_7_interactive_elements.json'
+                }
+            })))
+
+    except BaseException:
+        # Save what the finished stages produced, but let the stage failure
+        # surface rather than a write error raised while unwinding from it
+        try:
+            flush_stage_outputs(output_dir, pending_outputs)
+        except Exception as e:
+            print_warning(f"Could not save stage outputs: {e}")
+        raise
 
+    flush_stage_outputs(output_dir, pending_outputs)
     return results
 
 
-def save_stage_output(output_dir: Path, filename: str, content: str):
-    """Save stage output to file"""
+def save_stage_output(output_dir: Path, filename: str, content):
+    """Save stage output (text, or already encoded bytes) to file"""
     filepath = output_dir / filename
+    if isinstance(content, bytes):
+        with open(filepath, 'wb') as f:
+            f.write(content)
+        return
     with open(filepath, 'w', encoding='utf-8') as f:
         f.write(content)
 
 
-def stage_1_seo_queries(config: Dict[str, Any], llm_client) -> list:
-    """Stage 1: Generate SEO queries"""
-    prompt = f"""You are an elite SEO strategist and trend analyst specializing in high-demand, commercially viable topics within the health, wellness, and fitness niche. Your primary function is to generate short, realistic, and high-volume search queries that reflect exactly what users are actively searching for on platforms like Google, YouTube, and Reddit in 2025.
+def flush_stage_outputs(output_dir: Path, pending: list):
+    """Write queued (filename, content) stage outputs as a single batch"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    if not pending:
+        return
+    with ThreadPoolExecutor(max_workers=min(8, len(pending))) as executor:
+        # Consume the iterator so any write error is raised here
+        list(executor.map(lambda item: save_stage_output(output_dir, *item), pending))
+    pending.clear()
+
+
+def _iter_nonempty_lines(text: str):
+    """Yield the stripped, non-blank lines of text, one at a time"""
+    for raw in text.splitlines():
+        line = raw.strip()
+        if line:
+            yield line
+
+
+# Static Stage 1 instructions, sent as a cacheable prefix ahead of the inputs
+_SEO_PROMPT_PREFIX = """You are an elite SEO strategist and trend analyst specializing in high-demand, commercially viable topics within the health, wellness, and fitness niche. Your primary function is to generate short, realistic, and high-volume search queries that reflect exactly what users are actively searching for on platforms like Google, YouTube, and Reddit in 2025.
 
 🎯 Rules for Query Generation:
 • Output exactly one natural-language query per line.
@@ -422,9 +809,12 @@ def stage_1_seo_queries(config: Dict[str, Any], llm_client) -> list:
 
 Respond only with finalized search queries, clearly separated by new lines.
 
-Your task is to provide exactly 5 high-demand, natural-language search queries suitable for scraping and content ideation within the following scope. Each query must be phrased exactly as users would naturally type it and must adhere to all rules defined above.
+Your task is to provide exactly 5 high-demand, natural-language search queries suitable for scraping and content ideation within the following scope. Each query must be phrased exactly as users would naturally type it and must adhere to all rules defined above."""
+
 
-Input Parameters:
+def stage_1_seo_queries(config: Dict[str, Any], llm_client) -> list:
+    """Stage 1: Generate SEO queries"""
+    prompt = f"""Input Parameters:
 ● Topic: {config['topic']}
 ● Tone: {config['tone']}
 ● Mood: {config['mood']}
@@ -436,15 +826,13 @@ List only the 5 queries clearly, each separated by a new line, without explanati
 
     if llm_client:
         print_info("Streaming SEO query generation (live)...\n")
-        buf = []
-        def _stream(delta: str):
-            sys.stdout.write(delta)
-            sys.stdout.flush()
-            buf.append(delta)
-        response = llm_client.stream_generate(prompt, on_delta=_stream)
+        echo, flush_echo = _make_stream_printer()
+        # Greedy decoding, so the queries for a given config come from the disk cache on reruns
+        response = _cached_generate(llm_client, prompt, stream=True, on_delta=echo,
+                                    cache_prefix=_SEO_PROMPT_PREFIX, temperature=0)
+        flush_echo()
         print("\n")
-        queries = [q.strip() for q in response.strip().split('\n') if q.strip()]
-        return queries[:5]  # Ensure exactly 5 queries
+        return list(itertools.islice(_iter_nonempty_lines(response), 5))  # Ensure exactly 5 queries
     else:
         # Fallback queries
         return [
@@ -463,21 +851,27 @@ def stage_2_outline(config: Dict[str, Any], queries: list, llm_client) -> str:
     if llm_client:
         # Stream the outline so users can watch it generate live in terminal
         print_info("Streaming outline generation (live)...\n")
-        def _stream(delta: str):
-            # write incremental tokens without newlines forced
-            sys.stdout.write(delta)
-            sys.stdout.flush()
-        text = llm_client.stream_generate(
+        echo, flush_echo = _make_stream_printer()
+        text = _cached_generate(
+            llm_client,
             f"Generate eBook outline for: {config['topic']}",
-            on_delta=_stream
+            stream=True,
+            on_delta=echo
         )
+        flush_echo()
         print("\n")
         return text
     else:
         return f"# {config['topic'].title()}\n\n## Outline\n\n- Chapter 1\n- Chapter 2\n- Chapter 3\n- Chapter 4\n- Chapter 5"
 
 
-import re
+# Top-level chapter headings, e.g. '## Chapter 2 – Title' or '- Chapter 3 - Title'
+_CHAPTER_RE = re.compile(r'^(?:#{2,6}\s+|[-*]\s+)?Chapter\s+(\d+)\s*[–-]\s*(.+)$', re.IGNORECASE)
+# Section numbering such as '1.1' that must not be treated as a chapter
+_SECTION_RE = re.compile(r'^\d+\.\d+')
+# Em dashes are normalized to en dashes before matching
+_DASH_TABLE = str.maketrans('—', '–')
+
 
 def extract_chapter_titles(outline: str) -> list:
     """Extract only top-level chapter titles from an outline.
@@ -486,24 +880,30 @@ def extract_chapter_titles(outline: str) -> list:
       - '## Chapter 2 - Title'
       - '- Chapter 3 – Title'
     Ignores subheadings like '1.1', '2.3', etc.
+
+    Results are memoized on the outline text, so re-parsing an unchanged
+    outline (Stage 3 and Stage 4 both need it) is a cache lookup.
     """
+    return list(_extract_titles_cached(outline))
+
+
+@functools.lru_cache(maxsize=16)
+def _extract_titles_cached(outline: str) -> tuple:
+    """Parse chapter titles (memoized; see extract_chapter_titles)"""
     titles = []
-    for raw in outline.splitlines():
-        line = raw.strip()
-        if not line:
-            continue
+    for line in _iter_nonempty_lines(outline):
         # Normalize dashes
-        norm = line.replace('—', '–')
+        norm = line.translate(_DASH_TABLE)
         # Match markdown heading with 'Chapter N - Title'
-        m = re.match(r'^(?:#{2,6}\s+|[-*]\s+)?Chapter\s+(\d+)\s*[–-]\s*(.+)$', norm, re.IGNORECASE)
+        m = _CHAPTER_RE.match(norm)
         if m:
             title = m.group(2).strip().rstrip('.').strip()
             # Exclude lines that look like section numeration (e.g., '1.1. Something')
-            if not re.match(r'^\d+\.\d+', title):
+            if not _SECTION_RE.match(title):
                 # Ensure unique order-preserving
                 if title and title not in titles:
                     titles.append(title)
-    return titles
+    return tuple(titles)
 
 
 def stage_3_toc(outline: str, llm_client) -> str:
@@ -517,16 +917,100 @@ def stage_3_toc(outline: str, llm_client) -> str:
     return "\n".join(toc_lines) + "\n"
 
 
-def stage_4_chapters(config: Dict[str, Any], queries: list, llm_client) -> list:
-    """Stage 4: Generate chapter content based on top-level chapter titles only"""
-    # Derive titles from Stage 2 outline
-    outline_path = Path(config.get('output_dir', './output')) / 'stage_2_outline.md'
+def _chapter_prompt_prefix(config: Dict[str, Any]) -> str:
+    """Stage 4 instructions shared by every chapter (sent as a cacheable prefix)"""
+    return (f"You are writing chapters for the eBook on '{config['topic']}'. "
+            f"Target length ~{config.get('chapter_length', 2000)} words per chapter. "
+            f"Use clear subheadings and actionable takeaways.")
+
+
+def _chapter_prompt(i: int, title: str) -> str:
+    """Per-chapter part of the Stage 4 prompt"""
+    return f"Write Chapter {i} titled '{title}'."
+
+
+def _chapter_heading(i: int, title: str) -> str:
+    """Markdown heading used at the top of each chapter file"""
+    return f"# Chapter {i}: {title}"
+
+
+def _write_chapter_file(path: Path, i: int, title: str, text: str) -> Path:
+    """Write an already generated chapter, prefixed with its heading, to path"""
+    with open(path, 'w', encoding='utf-8', buffering=1 << 16) as fh:
+        fh.write(f"{_chapter_heading(i, title)}\n\n")
+        fh.write(text.strip() if text else "(Empty)")
+    return path
+
+
+class _StrippedSink:
+    """Text sink that drops leading and trailing whitespace from the streamed text.
+
+    Streamed chapters then match _write_chapter_file's text.strip(), so the
+    files don't depend on --max-concurrent-requests. Trailing whitespace is
+    held back until more text follows it.
+    """
+
+    def __init__(self, fh):
+        self.fh = fh
+        self.started = False
+        self.pending = ''
+
+    def write(self, delta: str):
+        if not self.started:
+            delta = delta.lstrip()
+            if not delta:
+                return
+            self.started = True
+        body = delta.rstrip()
+        if body:
+            self.fh.write(self.pending)
+            self.fh.write(body)
+            self.pending = delta[len(body):]
+        else:
+            self.pending += delta
+
+
+async def _write_chapters_concurrently(config: Dict[str, Any], titles: list, llm_client,
+                                       output_dir: Path, max_concurrent_requests: int) -> list:
+    """Write all chapters at once, keeping at most max_concurrent_requests in flight"""
+    import asyncio
+
+    semaphore = asyncio.Semaphore(max_concurrent_requests)
+    prefix = _chapter_prompt_prefix(config)
+
+    async def _write_chapter(i: int, title: str) -> Path:
+        async with semaphore:
+            text = await _cached_agenerate(llm_client, _chapter_prompt(i, title), cache_prefix=prefix)
+        path = _write_chapter_file(output_dir / f'stage_4_chapter_{i}.md', i, title, text)
+        print_success(f"Chapter {i} – {title} written")
+        return path
+
+    # gather() returns results in submission order, so chapters stay numbered
+    tasks = [_write_chapter(i, title) for i, title in enumerate(titles, 1)]
+    return list(await asyncio.gather(*tasks))
+
+
+def stage_4_chapters(config: Dict[str, Any], queries: list, llm_client,
+                     max_concurrent_requests: int = 1, outline: Optional[str] = None) -> list:
+    """Stage 4: Generate chapter content based on top-level chapter titles only
+
+    Chapters are written straight to stage_4_chapter_N.md in the output
+    directory and the list of file paths is returned, so chapter text is
+    never held in memory for the whole book.
+
+    With max_concurrent_requests > 1 chapters are requested concurrently and
+    live token streaming is disabled, since the streams would interleave.
+    """
+    output_dir = Path(config.get('output_dir', './output'))
+
+    # Derive titles from the Stage 2 outline passed in by execute_pipeline,
+    # falling back to the saved outline file
+    outline_path = output_dir / 'stage_2_outline.md'
     outline_text = ''
-    if outline_path.exists():
+    if outline is not None:
+        outline_text = outline
+    elif outline_path.exists():
         outline_text = outline_path.read_text(encoding='utf-8')
-    else:
-        # As a fallback, rely on the outline in memory if execute_pipeline passes it
-        outline_text = ""
 
     titles = extract_chapter_titles(outline_text) if outline_text else []
 
@@ -534,34 +1018,49 @@ def stage_4_chapters(config: Dict[str, Any], queries: list, llm_client) -> list:
     if not titles:
         titles = [f"Chapter {i+1}" for i in range(config.get('num_chapters', 5))]
 
-    chapters = []
+    if llm_client and max_concurrent_requests > 1:
+        import asyncio
+        print_info(f"Writing {len(titles)} chapters concurrently (up to {max_concurrent_requests} at a time)...\n")
+        return asyncio.run(_write_chapters_concurrently(config, titles, llm_client, output_dir, max_concurrent_requests))
+
+    prefix = _chapter_prompt_prefix(config)
+    chapter_paths = []
     for i, title in enumerate(titles, 1):
-        chapter_heading = f"# Chapter {i}: {title}"
+        path = output_dir / f'stage_4_chapter_{i}.md'
         if llm_client:
             print_info(f"Streaming Chapter {i} – {title} (live)...\n")
-            buf = []
-            def _stream(delta: str):
-                sys.stdout.write(delta)
-                sys.stdout.flush()
-                buf.append(delta)
-            prompt = (f"Write Chapter {i} titled '{title}' for the eBook on '{config['topic']}'. "
-                      f"Target length ~{config.get('chapter_length', 2000)} words. "
-                      f"Use clear subheadings and actionable takeaways.")
-            text = llm_client.stream_generate(prompt, on_delta=_stream)
+            # Tokens go to the chapter file as they arrive
+            with open(path, 'w', encoding='utf-8', buffering=1 << 16) as fh:
+                fh.write(f"{_chapter_heading(i, title)}\n\n")
+                echo, flush_echo = _make_stream_printer()
+                body = _StrippedSink(fh)
+                _cached_generate(llm_client, _chapter_prompt(i, title), stream=True, on_delta=echo,
+                                 sink=body, cache_prefix=prefix)
+                flush_echo()
+                if not body.started:
+                    fh.write("(Empty)")
             print("\n")
-            chapters.append(f"{chapter_heading}\n\n{text.strip()}" if text else f"{chapter_heading}\n\n(Empty)")
+            chapter_paths.append(path)
         else:
-            chapters.append(f"{chapter_heading}\n\nContent for {title}...")
-    return chapters
+            chapter_paths.append(_write_chapter_file(path, i, title, f"Content for {title}..."))
+    return chapter_paths
 
 
-def stage_5_optimize(chapters: list, llm_client) -> list:
-    """Stage 5: Optimize chapter content"""
+def stage_5_optimize(chapter_paths: list, llm_client) -> list:
+    """Stage 5: Optimize chapter content
+
+    Takes the Stage 4 chapter files and returns the optimized chapter files.
+    """
     # Simplified - would optimize each chapter
-    return chapters
+    optimized_paths = []
+    for i, path in enumerate(chapter_paths, 1):
+        optimized_path = path.parent / f'stage_5_optimized_chapter_{i}.md'
+        shutil.copyfile(path, optimized_path)
+        optimized_paths.append(optimized_path)
+    return optimized_paths
 
 
-def stage_6_cover(config: Dict[str, Any], first_chapter: str, llm_client) -> str:
+def stage_6_cover(config: Dict[str, Any], first_chapter: Path, llm_client) -> str:
     """Stage 6: Generate cover design prompt"""
     return f"Ultra-realistic, cinematic eBook cover for '{config['topic']}', emotional and transformative visual metaphor, high-resolution, A4 format."
 
@@ -601,95 +1100,172 @@ def stage_9_backgrounds(chapters: list, llm_client) -> list:
     return prompts
 
 
-def write_section_with_stream(title: str, body_prompt: str, llm_client, on_delta=None) -> str:
+def _section_prompt_prefix(config: Dict[str, Any]) -> str:
+    """Instructions shared by the intro, final thoughts and review sections (sent as a cacheable prefix)"""
+    return (f"You are writing sections of the eBook on '{config['topic']}' "
+            f"for {config['target_audience']}, in a {config.get('tone', 'empowering')} tone.")
+
+
+def write_section_with_stream(title: str, body_prompt: str, llm_client, on_delta=None,
+                              cache_prefix: Optional[str] = None) -> str:
     if not llm_client:
         return f"# {title}\n\n{body_prompt}\n"
-    buf = []
+    flush_echo = None
     if on_delta is None:
-        def on_delta(delta: str):
-            sys.stdout.write(delta)
-            sys.stdout.flush()
-            buf.append(delta)
-    else:
-        def wrapper(delta: str):
-            on_delta(delta)
-            buf.append(delta)
-        on_delta = wrapper
-    text = llm_client.stream_generate(body_prompt, on_delta=on_delta)
+        on_delta, flush_echo = _make_stream_printer()
+    text = _cached_generate(llm_client, body_prompt, stream=True, on_delta=on_delta, cache_prefix=cache_prefix)
+    if flush_echo:
+        flush_echo()
     print("\n")
     return f"# {title}\n\n{text.strip()}\n"
 
 
+def write_sections_chained(sections: list, llm_client, cache_prefix: Optional[str] = None) -> list:
+    """Write (label, title, prompt) sections with a single chained LLM request.
+
+    The sections are independent, so one request answers them all (see
+    llm_client.chain_prompt), with a max_tokens budget scaled to the number
+    of sections. Sections whose marker is missing from the response are
+    written with their own streamed request instead, and an incomplete
+    response is not cached.
+    """
+    from llm_client import chain_prompt, split_chain, hide_chain_markers
+
+    parts = [None] * len(sections)
+    if llm_client and len(sections) > 1:
+        print_stage(10, " + ".join(label for label, _, _ in sections))
+        params = {}
+        max_tokens = _effective_params(llm_client, {}).get('max_tokens')
+        if max_tokens:
+            params['max_tokens'] = max_tokens * len(sections)
+        echo, flush_echo = _make_stream_printer()
+        echo, flush_markers = hide_chain_markers(echo)
+        text = _cached_generate(llm_client, chain_prompt([prompt for _, _, prompt in sections]),
+                                stream=True, on_delta=echo, cache_prefix=cache_prefix,
+                                accept=lambda text: None not in split_chain(text, len(sections)),
+                                **params)
+        flush_markers()
+        flush_echo()
+        print("\n")
+        parts = split_chain(text, len(sections))
+        if None in parts:
+            print_warning("Chained response was missing sections; writing those one at a time")
+
+    written = []
+    for (label, title, prompt), part in zip(sections, parts):
+        if part is not None:
+            written.append(f"# {title}\n\n{part}\n")
+            continue
+        print_stage(10, label)
+        written.append(write_section_with_stream(title, prompt, llm_client, cache_prefix=cache_prefix))
+    return written
+
+
+def _write_gathered(f, chunks: list):
+    """Write byte chunks to binary file f, using a single os.writev where available"""
+    # writev is POSIX-only and limited to IOV_MAX (>= 1024 on Linux/macOS) buffers
+    if not hasattr(os, 'writev') or len(chunks) > 1024:
+        f.write(b''.join(chunks))
+        return
+    # Anything still buffered on f must reach the fd before the gathered write
+    f.flush()
+    written = os.writev(f.fileno(), chunks)
+    remaining = sum(len(chunk) for chunk in chunks) - written
+    if remaining:
+        # Short write: hand the rest to the buffered writer
+        f.write(b''.join(chunks)[written:])
+
+
+# Pre-encoded FINAL_EBOOK.md fragments
+_RULE = b"---\n\n"
+_SEP = b"\n" + _RULE
+_BLOCK_SEP = b"\n\n---\n\n"
+_CHAPTER_END = b"\n\n"
+_APPENDIX_HEADER = _BLOCK_SEP + b"# Appendix: Interactive Tools\n\n"
+_TITLE_FMT = "# {}\n\n".format
+_AUDIENCE_FMT = "*An eBook for {}*\n\n".format
+
+
 def compile_ebook(results: Dict[str, Any], output_dir: Path, llm_client=None) -> Path:
-    """Compile all components into final eBook"""
-    ebook_path = output_dir / 'FINAL_EBOOK.md'
+    """Compile all components into final eBook
+
+    The intro, final thoughts and review sections are generated first with
+    one chained request. Front matter (title, intro, TOC) and back matter
+    (final thoughts, review, appendix) are each collected as encoded chunks
+    and written with one gathered write; chapter bodies are copied straight
+    from the Stage 5 files.
+    """
+    from llm_client import create_llm_client
 
-    with open(ebook_path, 'w', encoding='utf-8') as f:
+    ebook_path = output_dir / 'FINAL_EBOOK.md'
+    config = results['config']
+    stages = results['stages']
+
+    # Intro, Final Thoughts and Leave a Review are independent of each other,
+    # so they are requested together up front
+    sections = {}
+    intro_min = config.get('intro_min_words')
+    intro_max = config.get('intro_max_words')
+    if intro_min and intro_max:
+        sections['intro'] = (f"Intro ({intro_min}-{intro_max} words)", "Introduction",
+                             f"Write the introductory section. Target length {intro_min}-{intro_max} words.")
+    final_min = config.get('final_min_words')
+    final_max = config.get('final_max_words')
+    if final_min and final_max:
+        sections['final'] = (f"Final Thoughts ({final_min}-{final_max} words)", "Final Thoughts",
+                             f"Write the final thoughts section. Target length {final_min}-{final_max} words.")
+    review_min = config.get('review_min_words')
+    review_max = config.get('review_max_words')
+    if review_min and review_max:
+        sections['review'] = (f"Leave a Review ({review_min}-{review_max} words)", "We'd Love Your Review",
+                              f"Write a short call-to-action asking readers to leave a review for the eBook. Target length {review_min}-{review_max} words.")
+    written = dict(zip(sections, write_sections_chained(
+        list(sections.values()),
+        llm_client or create_llm_client(provider='mock'),
+        cache_prefix=_section_prompt_prefix(config),
+    )))
+
+    with open(ebook_path, 'wb', buffering=1 << 20) as f:
         # Title page
-        f.write(f"# {results['config']['topic'].title()}\n\n")
-        f.write(f"*An eBook for {results['config']['target_audience']}*\n\n")
-        f.write("---\n\n")
-
-        # Intro section (streamed)
-        intro_min = results['config'].get('intro_min_words')
-        intro_max = results['config'].get('intro_max_words')
-        if intro_min and intro_max:
-            print_stage(10, f"Intro ({intro_min}-{intro_max} words)")
-            intro = write_section_with_stream(
-                "Introduction",
-                f"Write an introductory section for the eBook on '{results['config']['topic']}'. Target length {intro_min}-{intro_max} words.",
-                llm_client or create_llm_client(provider='mock'),
-            )
-            f.write(intro)
-            f.write("\n---\n\n")
+        front = [
+            _TITLE_FMT(config['topic'].title()).encode('utf-8'),
+            _AUDIENCE_FMT(config['target_audience']).encode('utf-8'),
+            _RULE,
+        ]
+
+        # Intro section
+        if 'intro' in written:
+            front += [written['intro'].encode('utf-8'), _SEP]
 
         # Table of Contents
-        if 'toc' in results['stages'].get('stage_3', {}):
-            f.write(results['stages']['stage_3']['toc'])
-            f.write("\n\n---\n\n")
-
-        # Optimized Chapters
-        if 'optimized_chapters' in results['stages'].get('stage_5', {}):
-            for i, chapter in enumerate(results['stages']['stage_5']['optimized_chapters'], 1):
-                f.write(f"{chapter}\n\n")
-                if i < len(results['stages']['stage_5']['optimized_chapters']):
-                    f.write("---\n\n")
-
-        # Final Thoughts (streamed)
-        final_min = results['config'].get('final_min_words')
-        final_max = results['config'].get('final_max_words')
-        if final_min and final_max:
-            print_stage(10, f"Final Thoughts ({final_min}-{final_max} words)")
-            final = write_section_with_stream(
-                "Final Thoughts",
-                f"Write final thoughts for the eBook on '{results['config']['topic']}'. Target length {final_min}-{final_max} words.",
-                llm_client or create_llm_client(provider='mock'),
-            )
-            f.write(final)
-            f.write("\n---\n\n")
-
-        # Leave a Review (streamed)
-        review_min = results['config'].get('review_min_words')
-        review_max = results['config'].get('review_max_words')
-        if review_min and review_max:
-            print_stage(10, f"Leave a Review ({review_min}-{review_max} words)")
-            review = write_section_with_stream(
-                "We'd Love Your Review",
-                f"Write a short call-to-action asking readers to leave a review for the eBook. Target length {review_min}-{review_max} words.",
-                llm_client or create_llm_client(provider='mock'),
-            )
-            f.write(review)
-            f.write("\n---\n\n")
+        if 'toc' in stages.get('stage_3', {}):
+            front += [stages['stage_3']['toc'].encode('utf-8'), _BLOCK_SEP]
+        _write_gathered(f, front)
+
+        # Optimized Chapters, copied byte-for-byte from the Stage 5 files
+        if 'optimized_chapters' in stages.get('stage_5', {}):
+            chapter_paths = stages['stage_5']['optimized_chapters']
+            for i, chapter_path in enumerate(chapter_paths, 1):
+                with open(chapter_path, 'rb') as src:
+                    shutil.copyfileobj(src, f, 1 << 20)
+                f.write(_BLOCK_SEP if i < len(chapter_paths) else _CHAPTER_END)
+
+        # Final Thoughts and Leave a Review
+        back = []
+        for key in ('final', 'review'):
+            if key in written:
+                back += [written[key].encode('utf-8'), _SEP]
 
         # Appendix: Interactive Elements
-        f.write("\n\n---\n\n# Appendix: Interactive Tools\n\n")
-        if 'interactive_elements' in results['stages'].get('stage_7', {}):
-            for elem in results['stages']['stage_7']['interactive_elements']:
-                f.write(f"## {elem.get('title', 'Interactive Element')}\n")
-                f.write(f"Type: {elem.get('type', 'N/A')}\n")
-                f.write(f"{elem.get('description', '')}\n\n")
-
-    print_info(f"eBook compiled with {len(results['stages'].get('stage_5', {}).get('optimized_chapters', []))} chapters")
+        back.append(_APPENDIX_HEADER)
+        if 'interactive_elements' in stages.get('stage_7', {}):
+            for elem in stages['stage_7']['interactive_elements']:
+                back.append((f"## {elem.get('title', 'Interactive Element')}\n"
+                             f"Type: {elem.get('type', 'N/A')}\n"
+                             f"{elem.get('description', '')}\n\n").encode('utf-8'))
+        _write_gathered(f, back)
+
+    print_info(f"eBook compiled with {len(stages.get('stage_5', {}).get('optimized_chapters', []))} chapters")
     return ebook_path
 
 
@@ -711,13 +1287,27 @@ Examples:
     parser.add_argument('--auto', action='store_true', help='Skip configuration review (use generated config as-is)')
     parser.add_argument('--provider', default='mock', choices=['anthropic', 'openai', 'gemini', 'openrouter', 'groq', 'custom', 'mock'],
                        help='LLM provider to use (default: mock for testing)')
-    parser.add_argument('--model', help='Specific model to use (e.g., claude-sonnet-4.5, gpt-4-turbo)')
+    parser.add_argument('--model', help='Specific model to use (e.g., claude-sonnet-4-5-20250929, gpt-4-turbo-2024-04-09)')
     parser.add_argument('--api-key', help='API key for LLM provider (or set via environment variable)')
     parser.add_argument('--params-only', action='store_true', help='Generate and review parameters only; save config and exit without running stages')
     parser.add_argument('--template', choices=['standard','quickstart','deepdive'], help='Book template to use: standard (default), quickstart, deepdive')
+    parser.add_argument('--no-cache', action='store_true', help=f'Always call the LLM instead of reusing cached responses from {CACHE_DIR} '
+                            '(by default only the config and SEO query responses are cached; see --deterministic-cache)')
+    parser.add_argument('--deterministic-cache', action='store_true',
+                       help='Also cache responses sampled with temperature > 0, so reruns replay them instead of generating new text')
+    parser.add_argument('--max-concurrent-requests', type=int, default=8,
+                       help='Maximum concurrent chapter requests; 1 streams chapters one at a time (default: 8)')
 
     args = parser.parse_args()
 
+    # Deferred so that --help does not pay for importing the LLM clients
+    from llm_client import create_llm_client
+
+    global _cache_enabled, _cache_sampled
+    if args.no_cache:
+        _cache_enabled = False
+    _cache_sampled = args.deterministic_cache
+
     print_header("Nine-Stage Automated eBook Generation System")
     print_info("Version 2.0 - Fully Automated Workflow")
 
@@ -735,6 +1325,11 @@ Examples:
         print_info("Falling back to mock client for testing")
         llm_client = create_llm_client(provider='mock')
 
+    # Open the provider connection while the config is generated and reviewed;
+    # --params-only runs stop before the generation stages, so skip it there
+    if not args.params_only:
+        threading.Thread(target=llm_client.warmup, daemon=True).start()
+
     # Create output directory
     output_dir = Path(args.output)
     if not output_dir.exists():
@@ -747,8 +1342,7 @@ Examples:
     if args.config and Path(args.config).exists():
         # Load from file
         print_info(f"Loading configuration from: {args.config}")
-        with open(args.config, 'r') as f:
-            config = yaml.safe_load(f)
+        config = load_config(args.config)
     elif args.topic:
         # Generate from topic
         config = generate_config_from_topic(args.topic, llm_client)
@@ -811,7 +1405,7 @@ Examples:
 
     # Execute pipeline
     try:
-        results = execute_pipeline(config, output_dir, llm_client)
+        results = execute_pipeline(config, output_dir, llm_client, max(1, args.max_concurrent_requests))
 
         # Success summary
         print_header("✓ eBook Generation Complete!")
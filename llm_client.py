@@ -4,154 +4,460 @@ LLM Client Wrapper
 Provides unified interface for different LLM providers (Anthropic, OpenAI, etc.)
 """
 
+import io
 import os
-from typing import Optional, Dict, Any
+import re
+import time
+import random
+import asyncio
+import contextlib
+import threading
+import inspect
+import functools
+from typing import Optional, Dict, Any, IO, Union
 from abc import ABC, abstractmethod
 
 
+def _chat_messages(prompt: str, cache_prefix: Optional[str] = None) -> list:
+    """Build chat messages for OpenAI-compatible APIs.
+
+    A cache_prefix shared by many calls goes first as the system message, so
+    providers with automatic prefix caching can reuse it across requests.
+    """
+    messages = [{"role": "user", "content": prompt}]
+    if cache_prefix:
+        messages.insert(0, {"role": "system", "content": cache_prefix})
+    return messages
+
+
+# Request timeouts for the anthropic/openai/groq SDKs. Their built-in retries are
+# disabled (max_retries=0) because _with_retries already retries transient errors.
+_CONNECT_TIMEOUT = 5.0
+_REQUEST_TIMEOUT = 300.0
+
+# One pooled httpx client per SDK module, shared by every client built on it.
+# Clients can be first built from the warmup thread and the main thread at once.
+_HTTP_CLIENTS: Dict[str, Any] = {}
+_HTTP_CLIENTS_LOCK = threading.Lock()
+
+
+def _shared_http_client(sdk) -> Dict[str, Any]:
+    """Constructor kwargs that reuse sdk's shared keep-alive connection pool"""
+    factory = getattr(sdk, 'DefaultHttpxClient', None)
+    if factory is None:
+        return {}
+    with _HTTP_CLIENTS_LOCK:
+        if sdk.__name__ not in _HTTP_CLIENTS:
+            import httpx
+            _HTTP_CLIENTS[sdk.__name__] = factory(
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32))
+        return {"http_client": _HTTP_CLIENTS[sdk.__name__]}
+
+
+# Transient API failures are retried with exponential backoff and jitter
+_RETRY_ATTEMPTS = 5
+_RETRY_MAX_WAIT = 30.0
+_RETRY_STATUSES = frozenset({408, 409, 429, 500, 502, 503, 504, 529})
+# SDK and transport exception class names treated as transient when no HTTP status is attached
+_TRANSIENT_ERRORS = frozenset({
+    'APIConnectionError', 'APITimeoutError', 'RateLimitError', 'InternalServerError',
+    'ConnectError', 'ConnectTimeout', 'ReadTimeout', 'ReadError', 'RemoteProtocolError',
+    'ResourceExhausted', 'ServiceUnavailable', 'DeadlineExceeded',
+})
+
+
+def _is_transient(e: Exception) -> bool:
+    """Whether e is worth retrying (rate limit, overload, timeout, dropped connection)"""
+    if isinstance(e, (ConnectionError, TimeoutError)):
+        return True
+    status = getattr(e, 'status_code', None)
+    if isinstance(status, int):
+        return status in _RETRY_STATUSES
+    return any(cls.__name__ in _TRANSIENT_ERRORS for cls in type(e).__mro__)
+
+
+def _retry_delay(e: Exception, attempt: int) -> float:
+    """Seconds to wait before the next attempt: Retry-After if sent, else random exponential"""
+    headers = getattr(getattr(e, 'response', None), 'headers', None) or {}
+    try:
+        return min(float(headers.get('retry-after')), _RETRY_MAX_WAIT)
+    except (TypeError, ValueError):
+        return random.uniform(1.0, min(_RETRY_MAX_WAIT, 2.0 ** attempt))
+
+
+def _with_retries(label: str):
+    """Retry a (sync or async) API call on transient errors; report only the final failure"""
+    def decorate(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                for attempt in range(1, _RETRY_ATTEMPTS + 1):
+                    try:
+                        return await fn(*args, **kwargs)
+                    except Exception as e:
+                        if attempt == _RETRY_ATTEMPTS or not _is_transient(e):
+                            print(f"Error calling {label} API: {e}")
+                            raise
+                        await asyncio.sleep(_retry_delay(e, attempt))
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            for attempt in range(1, _RETRY_ATTEMPTS + 1):
+                try:
+                    return fn(*args, **kwargs)
+                except Exception as e:
+                    if attempt == _RETRY_ATTEMPTS or not _is_transient(e):
+                        print(f"Error calling {label} API: {e}")
+                        raise
+                    time.sleep(_retry_delay(e, attempt))
+        return wrapper
+    return decorate
+
+
+@contextlib.contextmanager
+def _retrying_stream(label: str, open_stream):
+    """Enter the streaming context returned by open_stream(), retrying transient failures.
+
+    Only opening the stream is retried: once deltas have been passed on, a
+    retry would repeat them, so errors while iterating are left to the caller.
+    """
+    with contextlib.ExitStack() as stack:
+        yield _with_retries(label)(lambda: stack.enter_context(open_stream()))()
+
+
+def _require_sdk(module: str, package: str):
+    """Fail fast when a vendor SDK is missing, without paying to import it"""
+    import importlib.util
+    try:
+        found = importlib.util.find_spec(module) is not None
+    except ModuleNotFoundError:
+        found = False
+    if not found:
+        raise ImportError(f"Please install {package}: pip install {package}")
+
+
+# Chaining: several independent prompts answered by one request, each answer
+# introduced by a numbered marker line that split_chain() cuts on
+_CHAIN_MARKER = "<<<STAGE_{}>>>"
+_CHAIN_SPLIT_RE = re.compile(r"^<<<STAGE_(\d+)>>>[ \t]*$", re.MULTILINE)
+
+
+def chain_prompt(prompts: list) -> str:
+    """Combine independent prompts into one request whose answers come back marked <<<STAGE_k>>>"""
+    parts = ["Produce the following sections in order. Begin each section with its marker line "
+             "exactly as shown below, and write nothing before the first marker.\n"]
+    for k, prompt in enumerate(prompts, 1):
+        parts.append(f"{_CHAIN_MARKER.format(k)}\n{prompt}\n")
+    return "\n".join(parts)
+
+
+def split_chain(text: str, count: int) -> list:
+    """Split a response to chain_prompt() into its count sections; None for any that is missing"""
+    pieces = _CHAIN_SPLIT_RE.split(text)
+    # pieces is [preamble, '1', section 1, '2', section 2, ...]
+    sections = {int(num): body.strip() for num, body in zip(pieces[1::2], pieces[2::2])}
+    return [sections.get(k) for k in range(1, count + 1)]
+
+
+def hide_chain_markers(on_delta):
+    """Wrap a streaming on_delta callback so chain_prompt() marker lines are not passed on.
+
+    Returns (on_delta, flush). The start of each line is held back only while
+    it could still be a marker; call flush() when the stream ends.
+    """
+    held = ''
+    passthrough = False
+
+    def could_be_marker(line: str) -> bool:
+        return "<<<STAGE_".startswith(line[:9]) and re.fullmatch(r"\d*>{0,3}[ \t]*", line[9:]) is not None
+
+    def echo(delta: str):
+        nonlocal held, passthrough
+        while delta:
+            if passthrough:
+                end = delta.find('\n') + 1
+                if not end:
+                    on_delta(delta)
+                    return
+                on_delta(delta[:end])
+                delta, passthrough = delta[end:], False
+                continue
+            held += delta
+            delta = ''
+            end = held.find('\n') + 1
+            line = held[:end - 1] if end else held
+            if end and _CHAIN_SPLIT_RE.fullmatch(line):
+                # A whole marker line: drop it
+                delta, held = held[end:], ''
+            elif end or not could_be_marker(line):
+                delta, held, passthrough = held, '', True
+
+    def flush():
+        nonlocal held
+        if held and not _CHAIN_SPLIT_RE.fullmatch(held):
+            on_delta(held)
+        held = ''
+
+    return echo, flush
+
+
+class _StreamSink:
+    """Writes streamed deltas to sink (or an in-memory buffer) and forwards them to on_delta"""
+
+    def __init__(self, sink: Optional[IO[str]] = None, on_delta=None):
+        self.out = sink if sink is not None else io.StringIO()
+        self.owned = sink is None
+        self.on_delta = on_delta
+        self.written = 0
+
+    def write(self, delta: str):
+        self.out.write(delta)
+        self.written += len(delta)
+        if self.on_delta:
+            self.on_delta(delta)
+
+    def result(self) -> Union[str, int]:
+        """Full text when buffering internally, else the number of characters written to sink"""
+        return self.out.getvalue() if self.owned else self.written
+
+
+def _sdk_options(sdk, pooled: bool = True) -> Dict[str, Any]:
+    """Constructor kwargs shared by the anthropic, openai and groq SDK clients"""
+    import httpx
+    options = {"max_retries": 0, "timeout": httpx.Timeout(_REQUEST_TIMEOUT, connect=_CONNECT_TIMEOUT)}
+    if pooled:
+        options.update(_shared_http_client(sdk))
+    return options
+
+
 class LLMClient(ABC):
     """Abstract base class for LLM clients"""
 
     @abstractmethod
     def generate(self, prompt: str, **kwargs) -> str:
-        """Generate text from prompt"""
+        """Generate text from prompt.
+
+        Clients accept an optional cache_prefix: static instructions shared
+        across calls, sent ahead of prompt in a form the provider can cache.
+        """
         pass
 
-    def stream_generate(self, prompt: str, on_delta=None, **kwargs) -> str:
+    def stream_generate(self, prompt: str, on_delta=None, sink: Optional[IO[str]] = None, **kwargs) -> Union[str, int]:
         """Default streaming behavior: fallback to non-stream generate.
         Calls on_delta once with full text if provided. Returns full text.
+
+        Streaming clients write each delta to sink when one is given (e.g. an
+        open output file) instead of collecting the text in memory, and then
+        return the number of characters written.
         """
         text = self.generate(prompt, **kwargs)
         if on_delta:
             on_delta(text)
+        if sink is not None:
+            sink.write(text)
+            return len(text)
         return text
 
+    @property
+    def aclient(self):
+        """Async SDK client bound to the running event loop.
+
+        Async HTTP connections belong to the loop that opened them, and each
+        asyncio.run() starts a new loop, so a client built for an earlier run
+        (create_llm_client() instances are shared) is replaced rather than reused.
+        """
+        loop = asyncio.get_running_loop()
+        bound = getattr(self, '_aclient_bound', None)
+        if bound is None or bound[0] is not loop:
+            bound = self._aclient_bound = (loop, self._new_aclient())
+        return bound[1]
+
+    def _new_aclient(self):
+        """Build the async SDK client; implemented by clients that override agenerate()"""
+        raise NotImplementedError
+
+    async def agenerate(self, prompt: str, **kwargs) -> str:
+        """Async generate; by default runs the blocking generate() in a worker thread"""
+        return await asyncio.to_thread(self.generate, prompt, **kwargs)
+
+    def warmup(self):
+        """Best effort: import the SDK and open a connection before the first real request.
+
+        Uses a cheap model listing rather than a billed generation; clients
+        without an SDK client (e.g. MockClient) do nothing.
+        """
+        try:
+            models = getattr(self.client, 'models', None)
+            if models is not None:
+                models.list()
+        except Exception:
+            pass
+
 
 class AnthropicClient(LLMClient):
     """Anthropic Claude client"""
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "claude-sonnet-4.5"):
+    def __init__(self, api_key: Optional[str] = None, model: str = "claude-sonnet-4-5-20250929"):
         self.api_key = api_key or os.getenv('ANTHROPIC_API_KEY')
         self.model = model
 
         if not self.api_key:
             raise ValueError("Anthropic API key not provided. Set ANTHROPIC_API_KEY environment variable.")
 
-        try:
-            import anthropic
-            self.client = anthropic.Anthropic(api_key=self.api_key)
-        except ImportError:
-            raise ImportError("Please install anthropic: pip install anthropic")
+        _require_sdk('anthropic', 'anthropic')
 
-    def generate(self, prompt: str, max_tokens: int = 4096, temperature: float = 1.0, **kwargs) -> str:
-        """Generate text using Claude"""
-        try:
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=max_tokens,
-                temperature=temperature,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            return message.content[0].text
-        except Exception as e:
-            print(f"Error calling Anthropic API: {e}")
-            raise
+    # SDK clients are built (and the SDK imported) on first use
+    @functools.cached_property
+    def client(self):
+        import anthropic
+        return anthropic.Anthropic(api_key=self.api_key, **_sdk_options(anthropic))
+
+    def _new_aclient(self):
+        import anthropic
+        return anthropic.AsyncAnthropic(api_key=self.api_key, **_sdk_options(anthropic, pooled=False))
+
+    @staticmethod
+    def _system_blocks(cache_prefix: Optional[str]) -> Dict[str, Any]:
+        """Send a shared prefix as a cacheable system block"""
+        if not cache_prefix:
+            return {}
+        return {"system": [{"type": "text", "text": cache_prefix, "cache_control": {"type": "ephemeral"}}]}
 
-    def stream_generate(self, prompt: str, on_delta=None, max_tokens: int = 4096, temperature: float = 1.0, **kwargs) -> str:
+    @_with_retries("Anthropic")
+    def generate(self, prompt: str, max_tokens: int = 4096, temperature: float = 1.0,
+                 cache_prefix: Optional[str] = None, **kwargs) -> str:
+        """Generate text using Claude"""
+        message = self.client.messages.create(
+            model=self.model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            messages=[
+                {"role": "user", "content": prompt}
+            ],
+            **self._system_blocks(cache_prefix)
+        )
+        return message.content[0].text
+
+    @_with_retries("Anthropic")
+    async def agenerate(self, prompt: str, max_tokens: int = 4096, temperature: float = 1.0,
+                        cache_prefix: Optional[str] = None, **kwargs) -> str:
+        """Generate text using Claude via the async SDK"""
+        message = await self.aclient.messages.create(
+            model=self.model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            messages=[
+                {"role": "user", "content": prompt}
+            ],
+            **self._system_blocks(cache_prefix)
+        )
+        return message.content[0].text
+
+    def stream_generate(self, prompt: str, on_delta=None, max_tokens: int = 4096, temperature: float = 1.0,
+                        cache_prefix: Optional[str] = None, sink: Optional[IO[str]] = None, **kwargs) -> Union[str, int]:
         """Stream tokens using Anthropic Messages streaming."""
-        full = []
-        try:
-            with self.client.messages.stream(
-                model=self.model,
-                max_tokens=max_tokens,
-                temperature=temperature,
-                messages=[{"role": "user", "content": prompt}]
-            ) as stream:
+        if not hasattr(self.client.messages, 'stream'):
+            # This SDK version has no streaming helper: make one non-streaming request
+            return super().stream_generate(prompt, on_delta=on_delta, max_tokens=max_tokens, temperature=temperature,
+                                          cache_prefix=cache_prefix, sink=sink, **kwargs)
+        import anthropic
+        out = _StreamSink(sink, on_delta)
+        with _retrying_stream("Anthropic", lambda: self.client.messages.stream(
+            model=self.model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            messages=[{"role": "user", "content": prompt}],
+            **self._system_blocks(cache_prefix)
+        )) as stream:
+            try:
                 for event in stream:
                     delta = getattr(event, 'delta', None)
                     # anthropic python SDK streams content_block_delta events
                     if delta and hasattr(delta, 'text') and delta.text:
-                        full.append(delta.text)
-                        if on_delta:
-                            on_delta(delta.text)
-            return ''.join(full)
-        except Exception:
-            return super().stream_generate(prompt, on_delta=on_delta, max_tokens=max_tokens, temperature=temperature, **kwargs)
+                        out.write(delta.text)
+            except anthropic.APIError as e:
+                print(f"Error calling Anthropic API: {e}")
+                raise
+        return out.result()
 
 
 class OpenAIClient(LLMClient):
     """OpenAI GPT client"""
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4-turbo"):
+    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4-turbo-2024-04-09"):
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
         self.model = model
 
         if not self.api_key:
             raise ValueError("OpenAI API key not provided. Set OPENAI_API_KEY environment variable.")
 
-        try:
-            import openai
-            self.client = openai.OpenAI(api_key=self.api_key)
-        except ImportError:
-            raise ImportError("Please install openai: pip install openai")
+        _require_sdk('openai', 'openai')
 
-    def generate(self, prompt: str, max_tokens: int = 4096, temperature: float = 1.0, **kwargs) -> str:
-        """Generate text using GPT"""
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=max_tokens,
-                temperature=temperature
-            )
-            return response.choices[0].message.content
-        except Exception as e:
-            print(f"Error calling OpenAI API: {e}")
-            raise
+    # SDK clients are built (and the SDK imported) on first use
+    @functools.cached_property
+    def client(self):
+        import openai
+        return openai.OpenAI(api_key=self.api_key, **_sdk_options(openai))
+
+    def _new_aclient(self):
+        import openai
+        return openai.AsyncOpenAI(api_key=self.api_key, **_sdk_options(openai, pooled=False))
 
-    def stream_generate(self, prompt: str, on_delta=None, max_tokens: int = 4096, temperature: float = 1.0, **kwargs) -> str:
+    @_with_retries("OpenAI")
+    def generate(self, prompt: str, max_tokens: int = 4096, temperature: float = 1.0,
+                 cache_prefix: Optional[str] = None, **kwargs) -> str:
+        """Generate text using GPT"""
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=_chat_messages(prompt, cache_prefix),
+            max_tokens=max_tokens,
+            temperature=temperature
+        )
+        return response.choices[0].message.content
+
+    @_with_retries("OpenAI")
+    async def agenerate(self, prompt: str, max_tokens: int = 4096, temperature: float = 1.0,
+                        cache_prefix: Optional[str] = None, **kwargs) -> str:
+        """Generate text using GPT via the async SDK"""
+        response = await self.aclient.chat.completions.create(
+            model=self.model,
+            messages=_chat_messages(prompt, cache_prefix),
+            max_tokens=max_tokens,
+            temperature=temperature
+        )
+        return response.choices[0].message.content
+
+    def stream_generate(self, prompt: str, on_delta=None, max_tokens: int = 4096, temperature: float = 1.0,
+                        cache_prefix: Optional[str] = None, sink: Optional[IO[str]] = None, **kwargs) -> Union[str, int]:
         """Stream tokens using OpenAI-compatible streaming."""
-        full = []
-        try:
-            with self.client.chat.completions.stream(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=max_tokens,
-                temperature=temperature
-            ) as stream:
+        if not hasattr(self.client.chat.completions, 'stream'):
+            # This SDK version has no streaming helper: make one non-streaming request
+            return super().stream_generate(prompt, on_delta=on_delta, max_tokens=max_tokens, temperature=temperature,
+                                          cache_prefix=cache_prefix, sink=sink, **kwargs)
+        import openai
+        out = _StreamSink(sink, on_delta)
+        with _retrying_stream("OpenAI", lambda: self.client.chat.completions.stream(
+            model=self.model,
+            messages=_chat_messages(prompt, cache_prefix),
+            max_tokens=max_tokens,
+            temperature=temperature
+        )) as stream:
+            try:
                 for event in stream:
-                    # openai>=1.0 stream events
-                    delta = getattr(event, 'delta', None)
-                    if delta and delta.content:
-                        full.append(delta.content)
-                        if on_delta:
-                            on_delta(delta.content)
-                final = ''.join(full)
-                return final
-        except Exception as e:
-            # Fallback to non-stream if streaming unsupported
-            return super().stream_generate(prompt, on_delta=on_delta, max_tokens=max_tokens, temperature=temperature, **kwargs)
-
+                    # openai>=1.0 stream helper: content.delta events carry the new text as a str
+                    if getattr(event, 'type', None) == "content.delta" and event.delta:
+                        out.write(event.delta)
+            except openai.APIError as e:
+                print(f"Error calling OpenAI API: {e}")
+                raise
+        return out.result()
 
-class MockClient(LLMClient):
-    """Mock client for testing without API calls"""
-
-    def generate(self, prompt: str, **kwargs) -> str:
-        """Generate mock response"""
-        if "configuration" in prompt.lower() or "strategist" in prompt.lower() or "Given Topic:" in prompt:
-            # Extract topic from prompt if possible
-            topic = "wellness"
-            if "Given Topic:" in prompt:
-                try:
-                    topic = prompt.split("Given Topic:")[1].split("\n")[0].strip()
-                except:
-                    pass
 
-            return f"""```yaml
+# MockClient canned responses
+_MOCK_CONFIG_YAML = """```yaml
 topic: "{topic}"
-main_keyword: "{topic.split()[0] if topic else 'wellness'}"
+main_keyword: "{keyword}"
 theme: "science-backed transformation"
 target_audience: "busy professionals aged 30-50"
 tone: "empowering"
@@ -162,15 +468,13 @@ chapter_length: 2000
 interactive_elements_included: "Printable Tracker, Progress Checklist, Habit Worksheet"
 ```"""
 
-        elif "SEO" in prompt or "queries" in prompt.lower():
-            return """weight loss
+_MOCK_QUERIES = """weight loss
 weight loss tips
 how to lose weight
 weight loss diet
 weight loss for beginners"""
 
-        elif "outline" in prompt.lower() or "eBook" in prompt:
-            return """# Transform Your Body: The Science of Sustainable Weight Loss
+_MOCK_OUTLINE = """# Transform Your Body: The Science of Sustainable Weight Loss
 
 ## Core Transformation Summary
 This book guides busy professionals through evidence-based weight loss strategies that fit into hectic schedules. You'll discover sustainable approaches that prioritize health over quick fixes, combining nutrition science with behavioral psychology.
@@ -195,8 +499,7 @@ Goal: Navigate challenges and maintain momentum.
 Final Thoughts
 Goal: Embrace your transformation journey with confidence and knowledge."""
 
-        elif "Table of Contents" in prompt:
-            return """# Table of Contents
+_MOCK_TOC = """# Table of Contents
 
 Chapter 1: Metabolic Mastery
 Unlock the science of how your body burns energy
@@ -216,6 +519,43 @@ Push through barriers and stay consistent
 Final Thoughts
 Your journey starts now"""
 
+# Prompt classifiers, checked in order; case-insensitive except where scoped with (?-i:...)
+_MOCK_CONFIG_RE = re.compile(r"configuration|strategist|(?-i:Given Topic:)", re.IGNORECASE)
+_MOCK_SEO_RE = re.compile(r"(?-i:SEO)|queries", re.IGNORECASE)
+_MOCK_OUTLINE_RE = re.compile(r"outline|(?-i:eBook)", re.IGNORECASE)
+_MOCK_TOC_RE = re.compile(r"Table of Contents")
+
+
+class MockClient(LLMClient):
+    """Mock client for testing without API calls"""
+
+    def generate(self, prompt: str, cache_prefix: Optional[str] = None, **kwargs) -> str:
+        """Generate mock response"""
+        if _CHAIN_SPLIT_RE.search(prompt):
+            # Chained request: answer each marked section on its own
+            pieces = _CHAIN_SPLIT_RE.split(prompt)
+            return "\n\n".join(f"{_CHAIN_MARKER.format(num)}\n{self.generate(body.strip(), cache_prefix=cache_prefix)}"
+                                for num, body in zip(pieces[1::2], pieces[2::2]))
+        if cache_prefix:
+            prompt = f"{cache_prefix}\n\n{prompt}"
+        if _MOCK_CONFIG_RE.search(prompt):
+            # Extract topic from prompt if possible
+            topic = "wellness"
+            _, found, rest = prompt.partition("Given Topic:")
+            if found:
+                topic = rest.partition("\n")[0].strip()
+            keyword = topic.split()[0] if topic else 'wellness'
+            return _MOCK_CONFIG_YAML.format(topic=topic, keyword=keyword)
+
+        elif _MOCK_SEO_RE.search(prompt):
+            return _MOCK_QUERIES
+
+        elif _MOCK_OUTLINE_RE.search(prompt):
+            return _MOCK_OUTLINE
+
+        elif _MOCK_TOC_RE.search(prompt):
+            return _MOCK_TOC
+
         else:
             return f"Mock response for: {prompt[:100]}..."
 
@@ -227,38 +567,54 @@ class GeminiClient(LLMClient):
         self.model = model
         if not self.api_key:
             raise ValueError("Gemini API key not provided. Set GOOGLE_API_KEY or GEMINI_API_KEY.")
-        try:
-            import google.generativeai as genai
-            genai.configure(api_key=self.api_key)
-            self.client = genai
-        except ImportError:
-            raise ImportError("Please install google-generativeai: pip install google-generativeai")
+        _require_sdk('google.generativeai', 'google-generativeai')
 
-    def generate(self, prompt: str, max_tokens: int = 4096, temperature: float = 1.0, **kwargs) -> str:
-        try:
-            model = self.client.GenerativeModel(self.model)
-            resp = model.generate_content(prompt, generation_config={"temperature": temperature, "max_output_tokens": max_tokens})
-            return getattr(resp, 'text', '') or (resp.candidates[0].content.parts[0].text if resp.candidates else '')
-        except Exception as e:
-            print(f"Error calling Gemini API: {e}")
-            raise
+    @functools.cached_property
+    def client(self):
+        """The configured google.generativeai module, imported on first use"""
+        import google.generativeai as genai
+        genai.configure(api_key=self.api_key)
+        return genai
 
-    def stream_generate(self, prompt: str, on_delta=None, max_tokens: int = 4096, temperature: float = 1.0, **kwargs) -> str:
-        """Gemini streaming via generate_content with streaming flag (best-effort)."""
+    def warmup(self):
+        try:
+            next(iter(self.client.list_models()), None)
+        except Exception:
+            pass
+
+    @_with_retries("Gemini")
+    def generate(self, prompt: str, max_tokens: int = 4096, temperature: float = 1.0,
+                 cache_prefix: Optional[str] = None, **kwargs) -> str:
+        model = self.client.GenerativeModel(self.model, system_instruction=cache_prefix)
+        resp = model.generate_content(prompt, generation_config={"temperature": temperature, "max_output_tokens": max_tokens})
+        return getattr(resp, 'text', '') or (resp.candidates[0].content.parts[0].text if resp.candidates else '')
+
+    @_with_retries("Gemini")
+    async def agenerate(self, prompt: str, max_tokens: int = 4096, temperature: float = 1.0,
+                        cache_prefix: Optional[str] = None, **kwargs) -> str:
+        model = self.client.GenerativeModel(self.model, system_instruction=cache_prefix)
+        resp = await model.generate_content_async(prompt, generation_config={"temperature": temperature, "max_output_tokens": max_tokens})
+        return getattr(resp, 'text', '') or (resp.candidates[0].content.parts[0].text if resp.candidates else '')
+
+    def stream_generate(self, prompt: str, on_delta=None, max_tokens: int = 4096, temperature: float = 1.0,
+                        cache_prefix: Optional[str] = None, sink: Optional[IO[str]] = None, **kwargs) -> Union[str, int]:
+        """Gemini streaming via generate_content with streaming flag."""
+        from google.api_core.exceptions import GoogleAPIError
+        out = _StreamSink(sink, on_delta)
+        model = self.client.GenerativeModel(self.model, system_instruction=cache_prefix)
+        # The request is sent (and retried) here; errors while iterating are not retried
+        stream = _with_retries("Gemini")(model.generate_content)(
+            prompt, generation_config={"temperature": temperature, "max_output_tokens": max_tokens}, stream=True)
         try:
-            model = self.client.GenerativeModel(self.model)
-            stream = model.generate_content(prompt, generation_config={"temperature": temperature, "max_output_tokens": max_tokens}, stream=True)
-            full = []
             for chunk in stream:
                 # chunk.text for SDK >= 0.7
                 delta = getattr(chunk, 'text', None)
                 if delta:
-                    full.append(delta)
-                    if on_delta:
-                        on_delta(delta)
-            return ''.join(full)
-        except Exception:
-            return super().stream_generate(prompt, on_delta=on_delta, max_tokens=max_tokens, temperature=temperature, **kwargs)
+                    out.write(delta)
+        except GoogleAPIError as e:
+            print(f"Error calling Gemini API: {e}")
+            raise
+        return out.result()
 
 
 class OpenRouterClient(LLMClient):
@@ -268,44 +624,64 @@ class OpenRouterClient(LLMClient):
         self.model = model
         if not self.api_key:
             raise ValueError("OpenRouter API key not provided. Set OPENROUTER_API_KEY.")
-        try:
-            import openai
-            self.client = openai.OpenAI(api_key=self.api_key, base_url="https://openrouter.ai/api/v1")
-        except ImportError:
-            raise ImportError("Please install openai: pip install openai")
-
-    def generate(self, prompt: str, max_tokens: int = 4096, temperature: float = 1.0, **kwargs) -> str:
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=max_tokens,
-                temperature=temperature
-            )
-            return response.choices[0].message.content
-        except Exception as e:
-            print(f"Error calling OpenRouter API: {e}")
-            raise
-
-    def stream_generate(self, prompt: str, on_delta=None, max_tokens: int = 4096, temperature: float = 1.0, **kwargs) -> str:
+        _require_sdk('openai', 'openai')
+
+    @functools.cached_property
+    def client(self):
+        import openai
+        return openai.OpenAI(api_key=self.api_key, base_url="https://openrouter.ai/api/v1",
+                             **_sdk_options(openai))
+
+    def _new_aclient(self):
+        import openai
+        return openai.AsyncOpenAI(api_key=self.api_key, base_url="https://openrouter.ai/api/v1",
+                                  **_sdk_options(openai, pooled=False))
+
+    @_with_retries("OpenRouter")
+    def generate(self, prompt: str, max_tokens: int = 4096, temperature: float = 1.0,
+                 cache_prefix: Optional[str] = None, **kwargs) -> str:
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=_chat_messages(prompt, cache_prefix),
+            max_tokens=max_tokens,
+            temperature=temperature
+        )
+        return response.choices[0].message.content
+
+    @_with_retries("OpenRouter")
+    async def agenerate(self, prompt: str, max_tokens: int = 4096, temperature: float = 1.0,
+                        cache_prefix: Optional[str] = None, **kwargs) -> str:
+        response = await self.aclient.chat.completions.create(
+            model=self.model,
+            messages=_chat_messages(prompt, cache_prefix),
+            max_tokens=max_tokens,
+            temperature=temperature
+        )
+        return response.choices[0].message.content
+
+    def stream_generate(self, prompt: str, on_delta=None, max_tokens: int = 4096, temperature: float = 1.0,
+                        cache_prefix: Optional[str] = None, sink: Optional[IO[str]] = None, **kwargs) -> Union[str, int]:
         """Stream via OpenAI-compatible OpenRouter."""
-        full = []
-        try:
-            with self.client.chat.completions.stream(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=max_tokens,
-                temperature=temperature
-            ) as stream:
+        if not hasattr(self.client.chat.completions, 'stream'):
+            # This SDK version has no streaming helper: make one non-streaming request
+            return super().stream_generate(prompt, on_delta=on_delta, max_tokens=max_tokens, temperature=temperature,
+                                          cache_prefix=cache_prefix, sink=sink, **kwargs)
+        import openai
+        out = _StreamSink(sink, on_delta)
+        with _retrying_stream("OpenRouter", lambda: self.client.chat.completions.stream(
+            model=self.model,
+            messages=_chat_messages(prompt, cache_prefix),
+            max_tokens=max_tokens,
+            temperature=temperature
+        )) as stream:
+            try:
                 for event in stream:
-                    delta = getattr(event, 'delta', None)
-                    if delta and delta.content:
-                        full.append(delta.content)
-                        if on_delta:
-                            on_delta(delta.content)
-            return ''.join(full)
-        except Exception:
-            return super().stream_generate(prompt, on_delta=on_delta, max_tokens=max_tokens, temperature=temperature, **kwargs)
+                    if getattr(event, 'type', None) == "content.delta" and event.delta:
+                        out.write(event.delta)
+            except openai.APIError as e:
+                print(f"Error calling OpenRouter API: {e}")
+                raise
+        return out.result()
 
 
 class GroqClient(LLMClient):
@@ -315,44 +691,63 @@ class GroqClient(LLMClient):
         self.model = model
         if not self.api_key:
             raise ValueError("Groq API key not provided. Set GROQ_API_KEY.")
-        try:
-            from groq import Groq
-            self.client = Groq(api_key=self.api_key)
-        except ImportError:
-            raise ImportError("Please install groq: pip install groq")
-
-    def generate(self, prompt: str, max_tokens: int = 4096, temperature: float = 1.0, **kwargs) -> str:
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=max_tokens,
-                temperature=temperature
-            )
-            return response.choices[0].message.content
-        except Exception as e:
-            print(f"Error calling Groq API: {e}")
-            raise
-
-    def stream_generate(self, prompt: str, on_delta=None, max_tokens: int = 4096, temperature: float = 1.0, **kwargs) -> str:
+        _require_sdk('groq', 'groq')
+
+    @functools.cached_property
+    def client(self):
+        import groq
+        return groq.Groq(api_key=self.api_key, **_sdk_options(groq))
+
+    def _new_aclient(self):
+        import groq
+        return groq.AsyncGroq(api_key=self.api_key, **_sdk_options(groq, pooled=False))
+
+    @_with_retries("Groq")
+    def generate(self, prompt: str, max_tokens: int = 4096, temperature: float = 1.0,
+                 cache_prefix: Optional[str] = None, **kwargs) -> str:
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=_chat_messages(prompt, cache_prefix),
+            max_tokens=max_tokens,
+            temperature=temperature
+        )
+        return response.choices[0].message.content
+
+    @_with_retries("Groq")
+    async def agenerate(self, prompt: str, max_tokens: int = 4096, temperature: float = 1.0,
+                        cache_prefix: Optional[str] = None, **kwargs) -> str:
+        response = await self.aclient.chat.completions.create(
+            model=self.model,
+            messages=_chat_messages(prompt, cache_prefix),
+            max_tokens=max_tokens,
+            temperature=temperature
+        )
+        return response.choices[0].message.content
+
+    def stream_generate(self, prompt: str, on_delta=None, max_tokens: int = 4096, temperature: float = 1.0,
+                        cache_prefix: Optional[str] = None, sink: Optional[IO[str]] = None, **kwargs) -> Union[str, int]:
         """Stream tokens for Groq chat.completions if supported."""
-        full = []
-        try:
-            with self.client.chat.completions.stream(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=max_tokens,
-                temperature=temperature
-            ) as stream:
+        if not hasattr(self.client.chat.completions, 'stream'):
+            # This SDK version has no streaming helper: make one non-streaming request
+            return super().stream_generate(prompt, on_delta=on_delta, max_tokens=max_tokens, temperature=temperature,
+                                          cache_prefix=cache_prefix, sink=sink, **kwargs)
+        import groq
+        out = _StreamSink(sink, on_delta)
+        with _retrying_stream("Groq", lambda: self.client.chat.completions.stream(
+            model=self.model,
+            messages=_chat_messages(prompt, cache_prefix),
+            max_tokens=max_tokens,
+            temperature=temperature
+        )) as stream:
+            try:
                 for event in stream:
                     delta = getattr(event, 'delta', None)
                     if delta and delta.content:
-                        full.append(delta.content)
-                        if on_delta:
-                            on_delta(delta.content)
-            return ''.join(full)
-        except Exception:
-            return super().stream_generate(prompt, on_delta=on_delta, max_tokens=max_tokens, temperature=temperature, **kwargs)
+                        out.write(delta.content)
+            except groq.APIError as e:
+                print(f"Error calling Groq API: {e}")
+                raise
+        return out.result()
 
 
 class CustomClient(LLMClient):
@@ -363,43 +758,63 @@ class CustomClient(LLMClient):
         self.model = model or os.getenv('CUSTOM_LLM_MODEL', 'gpt-4o-mini')
         if not self.api_key or not self.base_url:
             raise ValueError("Custom provider requires CUSTOM_LLM_BASE_URL and CUSTOM_LLM_API_KEY env vars.")
-        try:
-            import openai
-            self.client = openai.OpenAI(api_key=self.api_key, base_url=self.base_url.rstrip('/'))
-        except ImportError:
-            raise ImportError("Please install openai: pip install openai")
-
-    def generate(self, prompt: str, max_tokens: int = 4096, temperature: float = 1.0, **kwargs) -> str:
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=max_tokens,
-                temperature=temperature
-            )
-            return response.choices[0].message.content
-        except Exception as e:
-            print(f"Error calling Custom LLM API: {e}")
-            raise
-
-    def stream_generate(self, prompt: str, on_delta=None, max_tokens: int = 4096, temperature: float = 1.0, **kwargs) -> str:
-        full = []
-        try:
-            with self.client.chat.completions.stream(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=max_tokens,
-                temperature=temperature
-            ) as stream:
+        _require_sdk('openai', 'openai')
+
+    @functools.cached_property
+    def client(self):
+        import openai
+        return openai.OpenAI(api_key=self.api_key, base_url=self.base_url.rstrip('/'),
+                             **_sdk_options(openai))
+
+    def _new_aclient(self):
+        import openai
+        return openai.AsyncOpenAI(api_key=self.api_key, base_url=self.base_url.rstrip('/'),
+                                  **_sdk_options(openai, pooled=False))
+
+    @_with_retries("Custom LLM")
+    def generate(self, prompt: str, max_tokens: int = 4096, temperature: float = 1.0,
+                 cache_prefix: Optional[str] = None, **kwargs) -> str:
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=_chat_messages(prompt, cache_prefix),
+            max_tokens=max_tokens,
+            temperature=temperature
+        )
+        return response.choices[0].message.content
+
+    @_with_retries("Custom LLM")
+    async def agenerate(self, prompt: str, max_tokens: int = 4096, temperature: float = 1.0,
+                        cache_prefix: Optional[str] = None, **kwargs) -> str:
+        response = await self.aclient.chat.completions.create(
+            model=self.model,
+            messages=_chat_messages(prompt, cache_prefix),
+            max_tokens=max_tokens,
+            temperature=temperature
+        )
+        return response.choices[0].message.content
+
+    def stream_generate(self, prompt: str, on_delta=None, max_tokens: int = 4096, temperature: float = 1.0,
+                        cache_prefix: Optional[str] = None, sink: Optional[IO[str]] = None, **kwargs) -> Union[str, int]:
+        if not hasattr(self.client.chat.completions, 'stream'):
+            # This SDK version has no streaming helper: make one non-streaming request
+            return super().stream_generate(prompt, on_delta=on_delta, max_tokens=max_tokens, temperature=temperature,
+                                          cache_prefix=cache_prefix, sink=sink, **kwargs)
+        import openai
+        out = _StreamSink(sink, on_delta)
+        with _retrying_stream("Custom LLM", lambda: self.client.chat.completions.stream(
+            model=self.model,
+            messages=_chat_messages(prompt, cache_prefix),
+            max_tokens=max_tokens,
+            temperature=temperature
+        )) as stream:
+            try:
                 for event in stream:
-                    delta = getattr(event, 'delta', None)
-                    if delta and delta.content:
-                        full.append(delta.content)
-                        if on_delta:
-                            on_delta(delta.content)
-            return ''.join(full)
-        except Exception:
-            return super().stream_generate(prompt, on_delta=on_delta, max_tokens=max_tokens, temperature=temperature, **kwargs)
+                    if getattr(event, 'type', None) == "content.delta" and event.delta:
+                        out.write(event.delta)
+            except openai.APIError as e:
+                print(f"Error calling Custom LLM API: {e}")
+                raise
+        return out.result()
 
 
 class ImageClient:
@@ -412,17 +827,19 @@ class ImageClient:
         if provider == "dalle":
             self.api_key = self.api_key or os.getenv('OPENAI_API_KEY')
             if self.api_key:
-                try:
-                    import openai
-                    self.client = openai.OpenAI(api_key=self.api_key)
-                except ImportError:
-                    raise ImportError("Please install openai: pip install openai")
+                _require_sdk('openai', 'openai')
         elif provider == "flux":
             self.api_key = self.api_key or os.getenv('REPLICATE_API_KEY')
 
+    @functools.cached_property
+    def client(self):
+        """OpenAI client for DALL-E, built on first use"""
+        import openai
+        return openai.OpenAI(api_key=self.api_key, **_shared_http_client(openai))
+
     def generate_image(self, prompt: str, **kwargs) -> str:
         """Generate image from prompt"""
-        if self.provider == "dalle" and hasattr(self, 'client'):
+        if self.provider == "dalle" and self.api_key:
             try:
                 response = self.client.images.generate(
                     model="dall-e-3",
@@ -439,11 +856,16 @@ class ImageClient:
             return f"[Mock image URL for: {prompt[:50]}...]"
 
 
+@functools.lru_cache(maxsize=8)
 def create_llm_client(provider: str = "anthropic", api_key: Optional[str] = None, model: Optional[str] = None) -> LLMClient:
-    """Factory function to create appropriate LLM client"""
+    """Factory function to create appropriate LLM client
+
+    Clients are cached per (provider, api_key, model), so repeated calls
+    reuse one instance and its open connections.
+    """
 
     if provider == "anthropic":
-        model = model or "claude-sonnet-4.5"
+        model = model or "claude-sonnet-4-5-20250929"
         try:
             return AnthropicClient(api_key=api_key, model=model)
         except (ValueError, ImportError) as e:
@@ -452,7 +874,7 @@ def create_llm_client(provider: str = "anthropic", api_key: Optional[str] = None
             return MockClient()
 
     elif provider == "openai":
-        model = model or "gpt-4-turbo"
+        model = model or "gpt-4-turbo-2024-04-09"
         try:
             return OpenAIClient(api_key=api_key, model=model)
         except (ValueError, ImportError) as e: